@@ -4,4 +4,4 @@ from __future__ import print_function
 __author__ = "bibow"
 
 __all__ = ["main"]
-from .main import McpProxyEngine, deploy
+from .main import McpProxyEngine, MissingPathError, deploy
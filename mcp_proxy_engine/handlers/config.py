@@ -4,15 +4,517 @@ from __future__ import print_function
 __author__ = "bibow"
 
 import asyncio
+import atexit
+import concurrent.futures
+import contextlib
+import copy
+import functools
+import hashlib
+import json
 import logging
-import traceback
-from typing import Any, Dict
-
-import boto3
+import os
+import re
+import stat
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Coroutine, Dict, List, Optional, Sequence, Tuple
+
+import botocore.session
+from botocore.config import Config as BotocoreConfig
 
 from mcp_http_client import MCPHttpClient
 from silvaengine_utility import Utility
 
+try:
+    import uvloop
+except ImportError:  # Optional speedup; not available on Windows
+    uvloop = None
+
+from .records import EndpointTables, Function, Parameter
+from .result_cache import ResultCache
+
+# Matches "{variable}" placeholders in function paths
+_PATH_VAR_RE = re.compile(r"\{(\w+)\}")
+
+# Mapping from JSON Schema types to Config function types
+JSON_SCHEMA_TYPE_MAPPING = {
+    "string": "string",
+    "number": "float",
+    "integer": "integer",
+    "boolean": "boolean",
+    "array": "list",
+    "object": "dict",
+}
+# Bound once; called for every property and array item during conversion
+_map_type = JSON_SCHEMA_TYPE_MAPPING.get
+
+# Parameter locations shared by every generated parameter
+_BODY, _QUERY, _PATH = sys.intern("body"), sys.intern("query"), sys.intern("path")
+
+# Shared by every Lambda invoke (GraphQL queries and schema fetches). The pool
+# is sized above the largest concurrent GraphQL fan-out so parallel invokes
+# reuse warm TLS connections instead of waiting on a free slot.
+LAMBDA_CLIENT_CONFIG = BotocoreConfig(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 5},
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_path_variables(path: str) -> tuple:
+    """
+    Extract variable names from path like /get/{id}/{name}
+
+    Returns: ("id", "name")
+    """
+    return tuple(_PATH_VAR_RE.findall(path))
+
+
+def _build_node(
+    prop_name: str,
+    prop_def: Dict[str, Any],
+    *,
+    top_level: bool,
+    method: Optional[str] = None,
+    path_variables: tuple = (),
+    required_fields: tuple = (),
+) -> Tuple[Parameter, Optional[Dict[str, Any]]]:
+    """
+    Build the parameter node for one JSON Schema property.
+
+    Top-level nodes (request parameters) also carry "in", "required",
+    "description", "enum" and "default"; nested nodes only carry their name,
+    type and children.
+
+    Returns:
+        The node and the child properties still to be converted into its
+        "properties" list (None if it has no children).
+    """
+    prop_type = prop_def.get("type")
+
+    # Property names parsed from tool schemas repeat across tools (id, name,
+    # limit, ...); interning keeps one copy of each in the functions list.
+    node = Parameter(
+        sys.intern(prop_name), _map_type(prop_def.get("type", "string"), "string")
+    )
+    if top_level:
+        # Determine parameter location
+        if method == "POST":
+            node.in_ = _BODY
+        elif prop_name in path_variables:
+            node.in_ = _PATH
+        else:
+            node.in_ = _QUERY
+        node.required = prop_name in required_fields
+        # Add description if available
+        if "description" in prop_def:
+            node.description = prop_def["description"]
+
+    children = None
+    # Handle nested objects
+    if prop_type == "object" and "properties" in prop_def:
+        children = prop_def["properties"]
+    # Handle arrays
+    elif prop_type == "array" and "items" in prop_def:
+        items = prop_def["items"]
+        node.child_type = _map_type(items.get("type", "string"), "string")
+        if items.get("type") == "object" and "properties" in items:
+            children = items["properties"]
+    if children is not None:
+        node.properties = []
+
+    if top_level:
+        # Handle enums
+        if "enum" in prop_def:
+            node.enum = prop_def["enum"]
+        # Handle defaults
+        if "default" in prop_def:
+            node.default = prop_def["default"]
+
+    return node, children
+
+
+# Characters with a regex meaning; literal segments containing them are
+# still matched as patterns, see _is_trie_segment
+_REGEX_SPECIAL = frozenset(".^$*+?()[]{}|\\")
+
+
+def _is_trie_segment(segment: str) -> bool:
+    """Return True if a path segment is a plain literal or a whole {variable}."""
+    return bool(_PATH_VAR_RE.fullmatch(segment)) or _REGEX_SPECIAL.isdisjoint(segment)
+
+
+def _new_trie_node() -> Dict[str, Any]:
+    return {"literals": {}, "variable": None, "terminal": None}
+
+
+def _insert_route(
+    root: Dict[str, Any], segments: List[str], index: int, function: Function
+) -> None:
+    """
+    Insert a function's path segments into a route trie.
+
+    The terminal records the function's position in the functions list, so
+    lookups can return the first matching function as the linear scan did.
+    """
+    node = root
+    for segment in segments:
+        if _PATH_VAR_RE.fullmatch(segment):
+            if node["variable"] is None:
+                node["variable"] = _new_trie_node()
+            node = node["variable"]
+        else:
+            child = node["literals"].get(segment)
+            if child is None:
+                child = node["literals"][sys.intern(segment)] = _new_trie_node()
+            node = child
+    if node["terminal"] is None:
+        node["terminal"] = (index, function, _extract_path_variables(function.path))
+
+
+def _match_trie(
+    root: Dict[str, Any], path: str
+) -> Optional[Tuple[int, Function, Dict[str, str]]]:
+    """
+    Find the first function (by position) whose path template matches path.
+
+    Walks the trie with an explicit stack, following both the literal child
+    and the {variable} child of each node, so the cost depends on the path
+    depth rather than the number of routes.
+
+    Returns:
+        (index, function, path_parameters), or None if nothing matches.
+    """
+    segments = path.split("/")
+    depth_end = len(segments)
+    best = None
+    stack = [(root, 0, ())]
+    while stack:
+        node, depth, values = stack.pop()
+        if depth == depth_end:
+            terminal = node["terminal"]
+            if terminal is not None and (best is None or terminal[0] < best[0][0]):
+                best = (terminal, values)
+            continue
+        segment = segments[depth]
+        child = node["literals"].get(segment)
+        if child is not None:
+            stack.append((child, depth + 1, values))
+        # Variables match one non-empty segment, like [^/]+
+        if segment and node["variable"] is not None:
+            stack.append((node["variable"], depth + 1, values + (segment,)))
+    if best is None:
+        return None
+    (index, function, names), values = best
+    return index, function, dict(zip(names, values))
+
+
+def _compile_route_group(
+    indexed_functions: List[Tuple[int, Function]],
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Combine the path patterns of several functions into one alternation.
+
+    Alternative i is the named group "r<i>" and its path variables are
+    "r<i>__<name>", so a single fullmatch both picks the first matching
+    function (alternatives are tried in order) and captures its variables.
+
+    Returns:
+        The combined pattern, and the branch group name -> (index, function,
+        ((group name, variable name), ...)) mapping used to read a match.
+    """
+    alternatives = []
+    branches = {}
+    for position, (index, function) in enumerate(indexed_functions):
+        branch = f"r{position}"
+        alternatives.append(
+            f"(?P<{branch}>"
+            + _PATH_VAR_RE.sub(rf"(?P<{branch}__\1>[^/]+)", function.path)
+            + ")"
+        )
+        branches[branch] = (
+            index,
+            function,
+            tuple(
+                (f"{branch}__{name}", name)
+                for name in _extract_path_variables(function.path)
+            ),
+        )
+    return re.compile("|".join(alternatives)), branches
+
+
+def _build_routes(functions: List[Function]) -> Dict[str, Dict[str, Any]]:
+    """
+    Partition functions into route lookup tables.
+
+    Returns:
+        static_routes: path -> function for paths without {variables}
+        dynamic_routes: "trie" -> segment trie (see _insert_route) of the
+            paths with {variables} whose segments are plain literals or
+            whole variables; "fallback" -> combined route group (see
+            _compile_route_group) of the remaining templated paths, or None.
+        match_route: the cached lookup over both, see _make_route_matcher
+    """
+    static_routes = {}
+    trie = _new_trie_node()
+    fallback = []
+    for index, function in enumerate(functions):
+        path = function.path
+        if not _PATH_VAR_RE.search(path):
+            # Keep the first function for a path, as the linear scan did
+            static_routes.setdefault(sys.intern(path), function)
+            continue
+        segments = path.split("/")
+        if all(_is_trie_segment(segment) for segment in segments):
+            _insert_route(trie, segments, index, function)
+        else:
+            fallback.append((index, function))
+    dynamic_routes = {
+        "trie": trie,
+        "fallback": _compile_route_group(fallback) if fallback else None,
+    }
+    return {
+        "static_routes": static_routes,
+        "dynamic_routes": dynamic_routes,
+        "match_route": _make_route_matcher(static_routes, dynamic_routes),
+    }
+
+
+def _make_route_matcher(
+    static_routes: Dict[str, Function], dynamic_routes: Dict[str, Any]
+) -> Any:
+    """
+    Build the path -> (function, path_parameters) lookup for a set of route
+    tables, where function is the matched Function record. Results are kept
+    in an LRU cache, since the same paths repeat across requests; the cached
+    parameter dicts must not be mutated.
+    """
+    trie = dynamic_routes.get("trie")
+    fallback = dynamic_routes.get("fallback")
+
+    @functools.lru_cache(maxsize=4096)
+    def match_route(
+        path: str,
+    ) -> Tuple[Optional[Function], Optional[Dict[str, str]]]:
+        # Paths without {variables} resolve with a single dict lookup
+        function = static_routes.get(path)
+        if function is not None:
+            return function, {}
+
+        # Otherwise walk the trie, and try the few templates that need regex
+        # matching; the match from the earlier function wins
+        best = _match_trie(trie, path) if trie is not None else None
+        if fallback is not None:
+            pattern, branches = fallback
+            match = pattern.fullmatch(path)
+            if match:
+                index, function, groups = branches[match.lastgroup]
+                if best is None or index < best[0]:
+                    return function, {
+                        name: match.group(group) for group, name in groups
+                    }
+        if best is None:
+            return None, None
+        return best[1], best[2]
+
+    return match_route
+
+
+def _parse_cache_ttl(
+    logger: logging.Logger, cache_ttl: Any, path: str
+) -> Optional[float]:
+    """
+    Return a mapping's cache_ttl as seconds, or None if it does not enable
+    result caching. Mappings may give it as a string; values that are not
+    positive numbers are logged and ignored rather than failing a request.
+    """
+    if not cache_ttl:
+        return None
+    try:
+        ttl = float(cache_ttl)
+    except (TypeError, ValueError):
+        ttl = None
+    if ttl is None or not ttl > 0:
+        logger.warning("Ignoring invalid cache_ttl %r for path %s", cache_ttl, path)
+        return None
+    return ttl
+
+
+def _convert_properties(
+    properties: Dict[str, Any],
+    top_level: bool = False,
+    method: Optional[str] = None,
+    path_variables: tuple = (),
+    required_fields: tuple = (),
+) -> list:
+    """
+    Convert JSON Schema properties into parameter nodes.
+
+    Walks the schema with an explicit work stack of
+    (parent_list, prop_name, prop_def, top_level) entries instead of
+    recursing, so deeply nested schemas cannot hit the interpreter recursion
+    limit. Siblings are pushed in reverse so they are emitted in schema order.
+    """
+    converted = []
+    stack = [
+        (converted, prop_name, prop_def, top_level)
+        for prop_name, prop_def in reversed(list(properties.items()))
+    ]
+
+    while stack:
+        parent, prop_name, prop_def, is_top_level = stack.pop()
+        node, children = _build_node(
+            prop_name,
+            prop_def,
+            top_level=is_top_level,
+            method=method,
+            path_variables=path_variables,
+            required_fields=required_fields,
+        )
+        parent.append(node)
+
+        if children is not None:
+            stack.extend(
+                (node.properties, child_name, child_def, False)
+                for child_name, child_def in reversed(list(children.items()))
+            )
+
+    return converted
+
+
+def _convert_input_schema_to_parameters(
+    input_schema: Dict[str, Any],
+    method: str,
+    path_variables: tuple = (),
+) -> list:
+    """
+    Convert JSON Schema to parameter list.
+
+    Rules:
+    - POST: all params in "body"
+    - GET: path variables in "path", others in "query"
+    """
+    return _convert_properties(
+        input_schema.get("properties", {}),
+        top_level=True,
+        method=method,
+        path_variables=path_variables,
+        required_fields=input_schema.get("required", []),
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _convert_input_schema_json(
+    input_schema_json: str, method: str, path_variables: tuple
+) -> tuple:
+    """Convert a JSON-encoded input schema, memoized on its encoding."""
+    return tuple(
+        _convert_input_schema_to_parameters(
+            json.loads(input_schema_json), method, path_variables
+        )
+    )
+
+
+def _get_input_schema_parameters(
+    input_schema: Dict[str, Any], method: str, path_variables: tuple = ()
+) -> list:
+    """
+    Convert an input schema to parameters, reusing earlier conversions.
+
+    Tools are reconverted whenever an endpoint is (re)built, mostly with
+    unchanged schemas. The key is the schema's JSON encoding without sorted
+    keys, since property order decides parameter order. The parameter
+    records are shared between functions and must not be mutated.
+    """
+    try:
+        input_schema_json = json.dumps(input_schema, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return _convert_input_schema_to_parameters(input_schema, method, path_variables)
+    return list(_convert_input_schema_json(input_schema_json, method, path_variables))
+
+
+def _convert_nested_properties(properties: Dict[str, Any]) -> list:
+    """Convert nested object properties."""
+    return _convert_properties(properties)
+
+
+def _map_json_schema_type(json_type: str) -> str:
+    """Map JSON Schema types to OpenAPI/Config types."""
+    return _map_type(json_type, "string")
+
+
+class AsyncLoopThread:
+    """
+    Long-lived asyncio event loop running on a dedicated daemon thread.
+    Synchronous callers submit coroutines to it instead of creating and
+    tearing down a fresh loop with asyncio.run for every call.
+
+    The loop is a uvloop loop when uvloop is installed. Only this loop is
+    affected; the global event loop policy is left alone. On Python 3.12+
+    tasks start eagerly, so tool calls that finish without suspending (e.g.
+    immediate errors) skip a scheduler round trip.
+    """
+
+    def __init__(self) -> None:
+        self.loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+        if sys.version_info >= (3, 12):
+            self.loop.set_task_factory(asyncio.eager_task_factory)
+        self.thread = threading.Thread(
+            target=self._run, name="mcp-proxy-engine-loop", daemon=True
+        )
+        self.thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop thread.
+
+        Callers block on the returned future, so submitting from the loop
+        thread itself would deadlock; that raises RuntimeError instead.
+        Args:
+            coro (Coroutine): Coroutine to run.
+
+        Returns:
+            concurrent.futures.Future: Future resolved with the coroutine result.
+        """
+        if threading.current_thread() is self.thread:
+            coro.close()
+            raise RuntimeError(
+                "Cannot submit to the MCP loop thread from the loop thread itself"
+            )
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Cancel the loop's remaining tasks, waiting up to timeout seconds for
+        them to finish, then stop the loop and wait for its thread to exit.
+        """
+
+        async def _cancel_tasks() -> None:
+            tasks = [
+                task
+                for task in asyncio.all_tasks()
+                if task is not asyncio.current_task()
+            ]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            self.submit(_cancel_tasks()).result(timeout)
+        except concurrent.futures.TimeoutError:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
 
 class Config:
     """
@@ -24,13 +526,76 @@ class Config:
     version = None
     servers = None
     aws_lambda = None
+    _aws_credentials = {}
+    # Shared so rebuilt clients reuse the already loaded service models
+    _botocore_session = None
+    _aws_lambda_lock = threading.Lock()
     schemas = {}
+    # function_name -> time.monotonic() deadline of the cls.schemas entry
+    _schema_expires_at = {}
+    # Private directory for schemas cached on disk, see _get_schema_cache_dir
+    _schema_cache_dir = None
+    schema_cache_ttl = 3600
+    # Per-cache TTLs in seconds from setting["cache_ttls"]: "graphql_schema"
+    # (defaults to schema_cache_ttl) and "endpoint" (unset: never expires)
+    cache_ttls = {}
+    # cache_ttls["endpoint"] as a number, or None to never expire
+    endpoint_cache_ttl = None
+    # One lock per function name so concurrent misses fetch a schema once
+    _schema_locks = {}
+    # Guards creation of the per-key locks, see _get_key_lock
+    _key_locks_guard = threading.Lock()
     response_mappings = {}
     internal_mcp = None
     mcp_servers = []
     functions = []
+    # Route tables for the active functions, see _build_routes
+    static_routes = {}
+    dynamic_routes = {}
+    # Cached path -> (function_name, path_parameters), see _make_route_matcher
+    match_route = staticmethod(_make_route_matcher({}, {}))
 
     mcp_http_clients = []
+    # function_name -> mcp_http_clients entry serving it
+    function_to_client = {}
+    # Tool results of the active endpoint, for routes whose response
+    # mapping sets "cache_ttl"; route path -> TTL in seconds
+    result_cache = ResultCache()
+    result_cache_ttls = {}
+    result_cache_maxsize = 10000
+    # Swagger YAML of the active endpoint, dropped with its endpoint data
+    swagger_cache = {}
+    # Maximum MCP requests in flight at once, per batch or tool discovery
+    mcp_concurrency_limit = 32
+    # Keeps the clients opened by initialize_mcp_http_clients entered
+    _exit_stack = None
+
+    # Per-endpoint mcp_servers/mcp_http_clients/functions, so re-used (warm)
+    # containers do not rebuild or duplicate them on every invocation
+    _endpoint_data = OrderedDict()
+    # Most endpoints kept built at once; the least recently activated one is
+    # evicted past this, see _evict_endpoint_data
+    endpoint_cache_maxsize = 64
+    # Exit stacks of the endpoints evicted last, closed on the next eviction
+    _evicted_exit_stacks = []
+    # Longest wait for MCP HTTP clients to close at shutdown, in seconds
+    exit_stack_close_timeout = 10
+    _endpoint_lock = threading.Lock()
+    # One lock per endpoint so concurrent first requests build it once
+    _endpoint_build_locks = {}
+    # Setting last passed to initialize; the generation is bumped whenever
+    # it changes, and endpoint data built under an older one is rebuilt
+    _setting = None
+    _settings_generation = 0
+    # Endpoint data most recently made current by _activate_endpoint_data
+    _active_endpoint_data = None
+
+    # GraphQL functions queried while initializing an endpoint
+    graphql_function_names = ["ai_agent_core_graphql"]
+
+    loop_thread = None
+    _loop_thread_lock = threading.Lock()
+    _shutdown_registered = False
 
     @classmethod
     def initialize(cls, logger: logging.Logger, **setting: Dict[str, Any]) -> None:
@@ -41,6 +606,9 @@ class Config:
             **setting (Dict[str, Any]): Configuration dictionary.
         """
         try:
+            if setting != cls._setting:
+                cls._setting = copy.deepcopy(setting)
+                cls._settings_generation += 1
             cls._set_parameters(setting)
             cls._initialize_aws_services(setting)
             cls._initialize_internal_mcp(setting)
@@ -60,11 +628,35 @@ class Config:
         cls.version = setting["version"]
         cls.servers = setting["servers"]
         cls.response_mappings = setting.get("response_mappings", {})
+        cls.cache_ttls = setting.get("cache_ttls", {})
+        cls.result_cache_maxsize = int(setting.get("result_cache_maxsize", 10000))
+        cls.endpoint_cache_maxsize = max(
+            1, int(setting.get("endpoint_cache_maxsize", 64))
+        )
+        # Semaphore(0) would block tool discovery forever, so keep at least 1
+        cls.mcp_concurrency_limit = max(
+            1, int(setting.get("mcp_concurrency_limit", 32))
+        )
+        cls.schema_cache_ttl = int(
+            cls.cache_ttls.get("graphql_schema", setting.get("schema_cache_ttl", 3600))
+        )
+        endpoint_ttl = cls.cache_ttls.get("endpoint")
+        if endpoint_ttl is not None:
+            endpoint_ttl = float(endpoint_ttl)
+            if endpoint_ttl < 0:
+                raise ValueError(
+                    f"cache_ttls['endpoint'] must not be negative, got {endpoint_ttl}"
+                )
+        cls.endpoint_cache_ttl = endpoint_ttl
 
     @classmethod
     def _initialize_aws_services(cls, setting: Dict[str, Any]) -> None:
         """
         Initialize AWS services, such as the S3 client.
+
+        Only the credentials are stored here; the Lambda client is built on
+        first use by get_aws_lambda, so deployments that never query GraphQL
+        skip the client construction cost.
         Args:
             setting (Dict[str, Any]): Configuration dictionary.
         """
@@ -80,7 +672,24 @@ class Config:
         else:
             aws_credentials = {}
 
-        cls.aws_lambda = boto3.client("lambda", **aws_credentials)
+        with cls._aws_lambda_lock:
+            # Rebuild the client on next use if the credentials changed
+            if aws_credentials != cls._aws_credentials:
+                cls.aws_lambda = None
+            cls._aws_credentials = aws_credentials
+
+    @classmethod
+    def get_aws_lambda(cls) -> Any:
+        """Return the shared Lambda client, creating it on first use."""
+        if cls.aws_lambda is None:
+            with cls._aws_lambda_lock:
+                if cls.aws_lambda is None:
+                    if cls._botocore_session is None:
+                        cls._botocore_session = botocore.session.get_session()
+                    cls.aws_lambda = cls._botocore_session.create_client(
+                        "lambda", config=LAMBDA_CLIENT_CONFIG, **cls._aws_credentials
+                    )
+        return cls.aws_lambda
 
     @classmethod
     def _initialize_internal_mcp(cls, setting: Dict[str, Any]) -> None:
@@ -92,14 +701,16 @@ class Config:
         if "internal_mcp" not in setting:
             return
         mcp_server = setting["internal_mcp"]
+        # Build the headers without writing them back into the caller's
+        # setting, which would make it differ on the next initialize
         if mcp_server.get("bearer_token"):
-            mcp_server["headers"] = {
-                "Authorization": f"Bearer {mcp_server['bearer_token']}"
-            }
+            headers = {"Authorization": f"Bearer {mcp_server['bearer_token']}"}
+        else:
+            headers = mcp_server["headers"]
         cls.internal_mcp = {
             "name": "internal_mcp",
             "base_url": mcp_server["base_url"],
-            "headers": mcp_server["headers"],
+            "headers": headers,
         }
 
     @classmethod
@@ -111,6 +722,19 @@ class Config:
         Args:
             setting (Dict[str, Any]): Configuration dictionary.
         """
+        mcp_servers = cls._fetch_mcp_servers(logger, endpoint_id, setting)
+
+        internal_mcp = cls._get_internal_mcp_server(endpoint_id)
+        if internal_mcp:
+            mcp_servers.append(internal_mcp)
+
+        cls.mcp_servers = mcp_servers
+
+    @classmethod
+    def _fetch_mcp_servers(
+        cls, logger: logging.Logger, endpoint_id: str, setting: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Fetch the MCP servers registered for the endpoint via GraphQL."""
         result = cls._execute_graphql_query(
             logger,
             endpoint_id,
@@ -121,61 +745,620 @@ class Config:
             setting=setting,
         )
 
-        if result["mcpServerList"]["total"] > 0:
-            for mcp_server in result["mcpServerList"]["mcpServerList"]:
-                cls.mcp_servers.append(
-                    {
-                        "name": mcp_server["mcpLabel"],
-                        "base_url": mcp_server["mcpServerUrl"],
-                        "headers": mcp_server["headers"],
-                    }
+        if result["mcpServerList"]["total"] == 0:
+            return []
+        return [
+            {
+                "name": mcp_server["mcpLabel"],
+                "base_url": mcp_server["mcpServerUrl"],
+                "headers": mcp_server["headers"],
+            }
+            for mcp_server in result["mcpServerList"]["mcpServerList"]
+        ]
+
+    @classmethod
+    def _get_internal_mcp_server(cls, endpoint_id: str) -> Optional[Dict[str, Any]]:
+        """Build the internal MCP server entry for the endpoint, if configured."""
+        if not cls.internal_mcp:
+            return None
+        internal_mcp = cls.internal_mcp.copy()
+        internal_mcp["base_url"] = internal_mcp["base_url"].format(
+            endpoint_id=endpoint_id
+        )
+        return internal_mcp
+
+    @classmethod
+    def initialize_for_endpoint(
+        cls, logger: logging.Logger, endpoint_id: str, setting: Dict[str, Any]
+    ) -> EndpointTables:
+        """
+        Set MCP servers and initialize their HTTP clients for an endpoint.
+
+        The endpoint is only built once per process and setting, or once per
+        cache_ttls["endpoint"] seconds when set; other calls reuse the stored
+        lists. At most endpoint_cache_maxsize endpoints are kept; the least
+        recently activated one is evicted and rebuilt if requested again.
+        Concurrent requests for the same endpoint wait for a single build,
+        while different endpoints build in parallel.
+        Args:
+            logger (logging.Logger): Logger instance for logging.
+            endpoint_id (str): ID of the endpoint.
+            setting (Dict[str, Any]): Configuration dictionary.
+
+        Returns:
+            EndpointTables: The endpoint's tables. Requests should read these
+                rather than the Config class attributes, which another thread
+                may switch to a different endpoint mid-request.
+        """
+        endpoint_data = cls._endpoint_data.get(endpoint_id)
+        if endpoint_data is None or cls._is_endpoint_data_stale(endpoint_data):
+            with cls._get_key_lock(cls._endpoint_build_locks, endpoint_id):
+                # Another thread may have built it while we waited
+                endpoint_data = cls._endpoint_data.get(endpoint_id)
+                if endpoint_data is None or cls._is_endpoint_data_stale(endpoint_data):
+                    endpoint_data = cls._refresh_endpoint_data(
+                        logger, endpoint_id, setting, endpoint_data
+                    )
+        elif endpoint_data is cls._active_endpoint_data:
+            # Already current (the common warm case): nothing to activate
+            return endpoint_data["tables"]
+
+        with cls._endpoint_lock:
+            # Activation marks the endpoint as recently used; the active
+            # endpoint's repeat requests take the fast path above
+            if endpoint_id in cls._endpoint_data:
+                cls._endpoint_data.move_to_end(endpoint_id)
+            cls._activate_endpoint_data(endpoint_data)
+        return endpoint_data["tables"]
+
+    @classmethod
+    def _is_endpoint_data_stale(cls, endpoint_data: Dict[str, Any]) -> bool:
+        """
+        Return True if endpoint data was built under an older setting, or is
+        older than cache_ttls["endpoint"].
+        """
+        if endpoint_data["settings_generation"] != cls._settings_generation:
+            return True
+        ttl = cls.endpoint_cache_ttl
+        if ttl is None:
+            return False
+        return time.monotonic() - endpoint_data["built_at"] >= ttl
+
+    @classmethod
+    def _refresh_endpoint_data(
+        cls,
+        logger: logging.Logger,
+        endpoint_id: str,
+        setting: Dict[str, Any],
+        previous: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Build and store an endpoint's data, retiring the previous build.
+
+        Requests on other threads may still be calling tools through the
+        previous clients, so they are only closed on the refresh after this
+        one (or at shutdown).
+        """
+        endpoint_data = cls._build_endpoint_data(logger, endpoint_id, setting)
+        if previous is not None:
+            endpoint_data["retired_exit_stack"] = previous["exit_stack"]
+        with cls._endpoint_lock:
+            cls._endpoint_data[endpoint_id] = endpoint_data
+            cls._endpoint_data.move_to_end(endpoint_id)
+            evicted = cls._evict_endpoint_data()
+            # Close the clients evicted last time; this time's may still be
+            # serving requests, so they wait for the next eviction
+            if evicted:
+                exit_stacks = cls._evicted_exit_stacks
+                cls._evicted_exit_stacks = evicted
+            else:
+                exit_stacks = []
+
+        retired_exit_stack = previous and previous.get("retired_exit_stack")
+        if retired_exit_stack is not None:
+            exit_stacks.append(retired_exit_stack)
+        cls._close_exit_stacks(logger, exit_stacks)
+        return endpoint_data
+
+    @classmethod
+    def _close_exit_stacks(
+        cls,
+        logger: logging.Logger,
+        exit_stacks: List[contextlib.AsyncExitStack],
+        wait: bool = False,
+    ) -> None:
+        """
+        Close exit stacks of MCP HTTP clients on the loop thread.
+
+        One unresponsive server must not hang the request that retires its
+        clients, so by default this does not wait and failures are only
+        logged. With wait (at shutdown) it waits at most
+        exit_stack_close_timeout seconds.
+        """
+        if not exit_stacks:
+            return
+        loop_thread = cls.get_loop_thread()
+
+        def _log_failure(future: concurrent.futures.Future) -> None:
+            if not future.cancelled() and future.exception() is not None:
+                logger.warning(
+                    "Failed to close MCP HTTP clients: %r", future.exception()
                 )
 
-        if cls.internal_mcp:
-            internal_mcp = cls.internal_mcp.copy()
-            internal_mcp["base_url"] = internal_mcp["base_url"].format(
-                endpoint_id=endpoint_id
+        futures = []
+        for exit_stack in exit_stacks:
+            future = loop_thread.submit(exit_stack.aclose())
+            future.add_done_callback(_log_failure)
+            futures.append(future)
+        if wait:
+            _, pending = concurrent.futures.wait(
+                futures, timeout=cls.exit_stack_close_timeout
+            )
+            if pending:
+                logger.warning(
+                    "Timed out closing %d group(s) of MCP HTTP clients", len(pending)
+                )
+
+    @classmethod
+    def _evict_endpoint_data(cls) -> List[contextlib.AsyncExitStack]:
+        """
+        Drop the least recently activated endpoints past endpoint_cache_maxsize.
+
+        Called with _endpoint_lock held. Returns the exit stacks of the
+        evicted builds, which the caller closes outside the lock.
+        """
+        exit_stacks = []
+        while len(cls._endpoint_data) > cls.endpoint_cache_maxsize:
+            endpoint_id, endpoint_data = cls._endpoint_data.popitem(last=False)
+            exit_stacks.append(endpoint_data["exit_stack"])
+            if endpoint_data.get("retired_exit_stack") is not None:
+                exit_stacks.append(endpoint_data["retired_exit_stack"])
+            with cls._key_locks_guard:
+                lock = cls._endpoint_build_locks.get(endpoint_id)
+                # A waiting builder still holds a reference; keep its lock
+                if lock is not None and not lock.locked():
+                    del cls._endpoint_build_locks[endpoint_id]
+        return exit_stacks
+
+    @classmethod
+    def _get_key_lock(cls, locks: Dict[str, threading.Lock], key: str) -> Any:
+        """Return the lock for key in locks, creating it if needed."""
+        with cls._key_locks_guard:
+            return locks.setdefault(key, threading.Lock())
+
+    @classmethod
+    def _activate_endpoint_data(cls, endpoint_data: Dict[str, Any]) -> None:
+        """Make an endpoint's servers, clients, functions and routes current."""
+        cls.mcp_servers = endpoint_data["mcp_servers"]
+        cls.mcp_http_clients = endpoint_data["mcp_http_clients"]
+        cls.functions = endpoint_data["functions"]
+        cls.static_routes = endpoint_data["static_routes"]
+        cls.dynamic_routes = endpoint_data["dynamic_routes"]
+        cls.match_route = staticmethod(endpoint_data["match_route"])
+        cls.function_to_client = endpoint_data["function_to_client"]
+        cls.result_cache = endpoint_data["result_cache"]
+        cls.result_cache_ttls = endpoint_data["result_cache_ttls"]
+        cls.swagger_cache = endpoint_data["swagger_cache"]
+        # Set last, so the fast path in initialize_for_endpoint never sees
+        # this endpoint as active before its tables are
+        cls._active_endpoint_data = endpoint_data
+
+    @classmethod
+    def get_active_tables(cls) -> EndpointTables:
+        """Return the active endpoint's tables, for callers that pass none."""
+        return EndpointTables(
+            mcp_http_clients=cls.mcp_http_clients,
+            functions=cls.functions,
+            match_route=cls.match_route,
+            function_to_client=cls.function_to_client,
+            result_cache=cls.result_cache,
+            result_cache_ttls=cls.result_cache_ttls,
+            swagger_cache=cls.swagger_cache,
+        )
+
+    @classmethod
+    def _build_endpoint_data(
+        cls, logger: logging.Logger, endpoint_id: str, setting: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Fetch an endpoint's MCP servers and tools into fresh sequences.
+
+        The internal MCP server does not depend on the GraphQL server list,
+        so its tool discovery runs on the loop thread while the GraphQL
+        mcpServerList query is in flight.
+        """
+        loop_thread = cls.get_loop_thread()
+        exit_stack = contextlib.AsyncExitStack()
+
+        internal_mcp = cls._get_internal_mcp_server(endpoint_id)
+        internal_servers = [internal_mcp] if internal_mcp else []
+        internal_future = loop_thread.submit(
+            cls._gather_list_mcp_http_tools(
+                exit_stack,
+                [
+                    MCPHttpClient(logger, **mcp_server)
+                    for mcp_server in internal_servers
+                ],
+            )
+        )
+
+        try:
+            cls.prefetch_schemas(
+                logger, endpoint_id, cls.graphql_function_names, setting
+            )
+            external_servers = cls._fetch_mcp_servers(logger, endpoint_id, setting)
+            external_results = loop_thread.submit(
+                cls._gather_list_mcp_http_tools(
+                    exit_stack,
+                    [
+                        MCPHttpClient(logger, **mcp_server)
+                        for mcp_server in external_servers
+                    ],
+                )
+            ).result()
+            internal_results = internal_future.result()
+        except Exception:
+            concurrent.futures.wait([internal_future])
+            cls._close_exit_stacks(logger, [exit_stack])
+            raise
+
+        endpoint_data = {
+            "mcp_servers": external_servers + internal_servers,
+            "mcp_http_clients": [],
+            "functions": [],
+            "exit_stack": exit_stack,
+            "built_at": time.monotonic(),
+            "settings_generation": cls._settings_generation,
+        }
+        for mcp_server, (mcp_http_client, tools) in zip(
+            endpoint_data["mcp_servers"], external_results + internal_results
+        ):
+            cls._register_mcp_http_client(
+                logger, endpoint_data, mcp_server, mcp_http_client, tools
             )
-            cls.mcp_servers.append(internal_mcp)
+        cls._index_endpoint_data(endpoint_data)
+        return endpoint_data
 
     @classmethod
     def initialize_mcp_http_clients(cls, logger: logging.Logger) -> None:
         """Initialize MCP HTTP clients and convert their tools to Config.functions"""
+        loop_thread = cls.get_loop_thread()
+        exit_stack = contextlib.AsyncExitStack()
 
-        for mcp_server in cls.mcp_servers:
-            mcp_http_client = MCPHttpClient(logger, **mcp_server)
+        # Fetch tools from all MCP servers concurrently on the shared loop
+        try:
+            results = loop_thread.submit(
+                cls._gather_list_mcp_http_tools(
+                    exit_stack,
+                    [
+                        MCPHttpClient(logger, **mcp_server)
+                        for mcp_server in cls.mcp_servers
+                    ],
+                )
+            ).result()
+        except Exception:
+            cls._close_exit_stacks(logger, [exit_stack])
+            raise
+
+        endpoint_data = {
+            "mcp_servers": cls.mcp_servers,
+            "mcp_http_clients": [],
+            "functions": [],
+        }
+        for mcp_server, (mcp_http_client, tools) in zip(cls.mcp_servers, results):
+            cls._register_mcp_http_client(
+                logger, endpoint_data, mcp_server, mcp_http_client, tools
+            )
+        cls._index_endpoint_data(endpoint_data)
 
-            # Fetch tools from MCP server
-            tools = asyncio.run(cls._run_list_mcp_http_tools(mcp_http_client))
+        # Close the clients opened by a previous call before replacing them
+        if cls._exit_stack is not None:
+            cls._close_exit_stacks(logger, [cls._exit_stack])
+        cls._exit_stack = exit_stack
+        cls._activate_endpoint_data(endpoint_data)
 
-            # Convert MCP tools to Config.functions format
-            mcp_functions = cls._convert_mcp_tools_to_functions(
-                tools,
-                mcp_server_name=mcp_server["name"],
-                response_mappings=cls.response_mappings,
-                logger=logger,
-            )
+    @classmethod
+    def _index_endpoint_data(cls, endpoint_data: Dict[str, Any]) -> None:
+        """Build the route tables, tool dispatch map and EndpointTables."""
+        # The stored sequences are shared by every request for the endpoint
+        # and activated by reference, so freeze them instead of copying
+        for key in ("mcp_servers", "mcp_http_clients", "functions"):
+            endpoint_data[key] = tuple(endpoint_data[key])
+
+        endpoint_data.update(_build_routes(endpoint_data["functions"]))
+
+        # function_name -> client entry; the first server exposing a tool
+        # wins, as the linear scan over mcp_http_clients did
+        function_to_client = {}
+        for mcp_http_client in endpoint_data["mcp_http_clients"]:
+            for tool_name in mcp_http_client["tools"]:
+                function_to_client.setdefault(tool_name, mcp_http_client)
+        endpoint_data["function_to_client"] = function_to_client
+
+        # Results are cached per endpoint build, so a rebuild with refreshed
+        # tools starts empty. TTLs are per route, since several mappings may
+        # share a tool; the first function for a path wins, as in routing
+        result_cache_ttls = {}
+        for function in endpoint_data["functions"]:
+            if function.metadata.get("cacheable"):
+                result_cache_ttls.setdefault(
+                    function.path, float(function.metadata["cache_ttl"])
+                )
+        endpoint_data["result_cache_ttls"] = result_cache_ttls
+        endpoint_data["result_cache"] = ResultCache(cls.result_cache_maxsize)
+        # The generated Swagger YAML lives and is evicted with the endpoint
+        endpoint_data["swagger_cache"] = {}
+
+        endpoint_data["tables"] = EndpointTables(
+            mcp_http_clients=endpoint_data["mcp_http_clients"],
+            functions=endpoint_data["functions"],
+            match_route=endpoint_data["match_route"],
+            function_to_client=endpoint_data["function_to_client"],
+            result_cache=endpoint_data["result_cache"],
+            result_cache_ttls=endpoint_data["result_cache_ttls"],
+            swagger_cache=endpoint_data["swagger_cache"],
+        )
+
+    @classmethod
+    def _register_mcp_http_client(
+        cls,
+        logger: logging.Logger,
+        endpoint_data: Dict[str, list],
+        mcp_server: Dict[str, Any],
+        mcp_http_client: MCPHttpClient,
+        tools: list,
+    ) -> None:
+        """Convert a server's tools to functions and store its client."""
+        # Convert MCP tools to Config.functions format
+        mcp_functions = cls._convert_mcp_tools_to_functions(
+            tools,
+            mcp_server_name=mcp_server["name"],
+            response_mappings=cls.response_mappings,
+            logger=logger,
+        )
+
+        # Append to the endpoint's functions
+        endpoint_data["functions"].extend(mcp_functions)
 
-            # Append to Config.functions
-            cls.functions.extend(mcp_functions)
+        # Store client for runtime execution
+        endpoint_data["mcp_http_clients"].append(
+            {
+                "name": mcp_server["name"],
+                "client": mcp_http_client,
+                "tools": [tool.name for tool in tools],
+            }
+        )
+
+        logger.info(
+            f"Loaded {len(mcp_functions)} tools from MCP server '{mcp_server['name']}'"
+        )
+
+    @classmethod
+    def get_loop_thread(cls) -> AsyncLoopThread:
+        """
+        Return the shared AsyncLoopThread, starting it on first use.
+
+        The first start also registers shutdown to run at interpreter exit,
+        so the long-lived MCP HTTP sessions are closed cleanly.
+        """
+        if cls.loop_thread is None:
+            with cls._loop_thread_lock:
+                if cls.loop_thread is None:
+                    cls.loop_thread = AsyncLoopThread()
+                    if not cls._shutdown_registered:
+                        atexit.register(cls.shutdown)
+                        cls._shutdown_registered = True
+        return cls.loop_thread
+
+    @classmethod
+    def batch_call_tools(
+        cls,
+        logger: logging.Logger,
+        calls: List[Tuple[str, str, Dict[str, Any]]],
+        max_concurrent: Optional[int] = None,
+        stop_on_error: bool = False,
+        mcp_http_clients: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> list:
+        """
+        Call several MCP tools concurrently on the shared loop thread.
+        Args:
+            logger (logging.Logger): Logger instance for logging.
+            calls (List[Tuple[str, str, Dict[str, Any]]]): (mcp_server_name,
+                tool_name, arguments) for each call.
+            max_concurrent (Optional[int]): Maximum number of calls in flight
+                at once (at least 1); defaults to mcp_concurrency_limit.
+            stop_on_error (bool): Cancel the outstanding calls and raise on the
+                first failure instead of collecting it.
+            mcp_http_clients (Optional[Sequence[Dict[str, Any]]]): Clients
+                to call through, e.g. EndpointTables.mcp_http_clients;
+                defaults to the active endpoint's.
 
-            # Store client for runtime execution
-            cls.mcp_http_clients.append(
-                {
-                    "name": mcp_server["name"],
-                    "client": mcp_http_client,
-                    "tools": [tool.name for tool in tools],
-                }
+        Returns:
+            list: Tool results in the order of calls. Without stop_on_error a
+                failed call's entry is the exception it raised.
+        """
+        # Server names are not guaranteed unique; the first server with a
+        # name wins, as in function_to_client
+        clients_by_name = {}
+        for mcp_http_client in (
+            cls.mcp_http_clients if mcp_http_clients is None else mcp_http_clients
+        ):
+            clients_by_name.setdefault(
+                mcp_http_client["name"], mcp_http_client["client"]
+            )
+        if max_concurrent is None:
+            max_concurrent = cls.mcp_concurrency_limit
+        max_concurrent = max(1, max_concurrent)
+        return (
+            cls.get_loop_thread()
+            .submit(
+                cls._run_batch_call_tools(
+                    logger,
+                    [
+                        (clients_by_name[mcp_server_name], name, arguments)
+                        for mcp_server_name, name, arguments in calls
+                    ],
+                    max_concurrent,
+                    stop_on_error,
+                )
             )
+            .result()
+        )
 
-            logger.info(
-                f"Loaded {len(mcp_functions)} tools from MCP server '{mcp_server['name']}'"
+    @classmethod
+    def call_tool(
+        cls,
+        logger: logging.Logger,
+        mcp_http_client: MCPHttpClient,
+        name: str,
+        arguments: Dict[str, Any],
+    ) -> Any:
+        """
+        Call one MCP tool through the given client on the shared loop thread.
+        Args:
+            logger (logging.Logger): Logger instance for logging.
+            mcp_http_client (MCPHttpClient): The client serving the tool, e.g.
+                the "client" of a function_to_client entry.
+            name (str): Name of the tool.
+            arguments (Dict[str, Any]): Arguments to pass to the tool.
+
+        Returns:
+            Any: The tool result.
+        """
+        return (
+            cls.get_loop_thread()
+            .submit(
+                cls._run_call_mcp_http_tool(logger, mcp_http_client, name, arguments)
             )
+            .result()
+        )
 
     @classmethod
-    async def _run_list_mcp_http_tools(cls, mcp_http_client):
-        async with mcp_http_client as client:
-            return await client.list_tools()
+    async def _run_batch_call_tools(
+        cls,
+        logger: logging.Logger,
+        calls: List[Tuple[MCPHttpClient, str, Dict[str, Any]]],
+        max_concurrent: int,
+        stop_on_error: bool,
+    ) -> list:
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def _call(mcp_http_client, name, arguments):
+            async with semaphore:
+                return await cls._run_call_mcp_http_tool(
+                    logger, mcp_http_client, name, arguments
+                )
+
+        tasks = [asyncio.ensure_future(_call(*call)) for call in calls]
+        if not stop_on_error:
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                await task
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return [task.result() for task in tasks]
+
+    @classmethod
+    async def _run_call_mcp_http_tool(
+        cls,
+        logger: logging.Logger,
+        mcp_http_client: MCPHttpClient,
+        name: str,
+        arguments: Dict[str, Any],
+    ) -> Any:
+        # Lazy %-formatting: results can be large and INFO is often disabled
+        logger.info("Calling MCP HTTP tool: %s with arguments: %s", name, arguments)
+
+        # The client was entered during initialization and stays open on the
+        # loop thread, so its HTTP connections are reused across calls.
+        result = await mcp_http_client.call_tool(name, arguments)
+
+        logger.info("MCP HTTP tool %s returned result: %s", name, result)
+
+        return result
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Close every open MCP HTTP client and stop the loop thread."""
+        loop_thread = cls.loop_thread
+        if loop_thread is None:
+            return
+
+        with cls._endpoint_lock:
+            exit_stacks = [
+                exit_stack
+                for endpoint_data in cls._endpoint_data.values()
+                for exit_stack in (
+                    endpoint_data["exit_stack"],
+                    endpoint_data.get("retired_exit_stack"),
+                )
+                if exit_stack is not None
+            ]
+            exit_stacks.extend(cls._evicted_exit_stacks)
+            if cls._exit_stack is not None:
+                exit_stacks.append(cls._exit_stack)
+            cls._close_exit_stacks(logging.getLogger(__name__), exit_stacks, wait=True)
+
+            cls._endpoint_data = OrderedDict()
+            cls._evicted_exit_stacks = []
+            cls._active_endpoint_data = None
+            cls._exit_stack = None
+            cls.mcp_http_clients = []
+            cls.functions = []
+            cls.static_routes = {}
+            cls.dynamic_routes = {}
+            cls.match_route = staticmethod(_make_route_matcher({}, {}))
+            cls.function_to_client = {}
+            cls.result_cache = ResultCache()
+            cls.result_cache_ttls = {}
+            cls.swagger_cache = {}
+
+        with cls._loop_thread_lock:
+            loop_thread.stop(cls.exit_stack_close_timeout)
+            cls.loop_thread = None
+
+    @classmethod
+    async def _run_list_mcp_http_tools(
+        cls, exit_stack: contextlib.AsyncExitStack, mcp_http_client: MCPHttpClient
+    ) -> Tuple[Any, list]:
+        """
+        Enter the client on the exit stack and list its tools.
+
+        The client stays open until the exit stack is closed, so later
+        call_tool requests reuse its HTTP connections.
+        """
+        client = await exit_stack.enter_async_context(mcp_http_client)
+        return client, await client.list_tools()
+
+    @classmethod
+    async def _gather_list_mcp_http_tools(
+        cls,
+        exit_stack: contextlib.AsyncExitStack,
+        mcp_http_clients: List[MCPHttpClient],
+    ) -> List[Tuple[Any, list]]:
+        semaphore = asyncio.Semaphore(cls.mcp_concurrency_limit)
+
+        async def _list(mcp_http_client):
+            async with semaphore:
+                return await cls._run_list_mcp_http_tools(exit_stack, mcp_http_client)
+
+        # Wait for every server before raising so that no client is entered
+        # after the caller has closed the exit stack.
+        results = await asyncio.gather(
+            *[_list(mcp_http_client) for mcp_http_client in mcp_http_clients],
+            return_exceptions=True,
+        )
+        listed = []
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+            listed.append(result)
+        return listed
 
     @classmethod
     def _convert_mcp_tools_to_functions(
@@ -199,26 +1382,41 @@ class Config:
         - If path has {variables} -> GET, else POST
         - summary = tool.description
         - in = "body" if POST, "path" for path variables if GET
+        - metadata.cache_ttl = optional "cache_ttl" (seconds) of the mapping,
+          a hint for HTTP layers to send Cache-Control: max-age; it also
+          enables the tool result cache (Config.result_cache)
         """
         functions = []
 
-        # Create a mapping of tool.name to tool for quick lookup
-        tools_by_name = {tool.name: tool for tool in tools}
+        # Map tool.name to (description, input_schema) for quick lookup, so
+        # each tool's attributes are read once. When the mappings name only
+        # a few of the tools, index just those.
+        if len(response_mappings) * 2 < len(tools):
+            wanted = {
+                path.partition("/")[2].partition("/")[0] for path in response_mappings
+            }
+            tools_by_name = {}
+            for tool in tools:
+                name = tool.name
+                if name in wanted:
+                    tools_by_name[name] = (tool.description, tool.input_schema)
+        else:
+            tools_by_name = {
+                tool.name: (tool.description, tool.input_schema) for tool in tools
+            }
 
         # Iterate through response_mappings (path as key)
         for path, response_config in response_mappings.items():
             # Extract function_name from path (first part after splitting by "/")
-            path_parts = path.split("/")
-
-            # path_parts[0] is empty string, path_parts[1] is the function name
-            if len(path_parts) < 2:
+            _, separator, rest = path.partition("/")
+            if not separator:
                 logger.warning(
                     f"Invalid path format '{path}' in MCP server '{mcp_server_name}'. "
                     f"Skipping..."
                 )
                 continue
 
-            function_name = path_parts[1]
+            function_name = rest.partition("/")[0]
 
             # Check if this function_name matches any MCP tool
             if function_name not in tools_by_name:
@@ -228,172 +1426,76 @@ class Config:
                 )
                 continue
 
-            tool = tools_by_name[function_name]
-
-            # Determine method based on path variables
-            has_path_variables = "{" in path and "}" in path
-            method = "GET" if has_path_variables else "POST"
+            description, input_schema = tools_by_name[function_name]
 
-            # Extract path variables if GET
-            path_variables = cls._extract_path_variables(path)
+            # Extract path variables once; they also determine the method
+            path_variables = _extract_path_variables(path)
+            method = "GET" if path_variables else "POST"
 
             # Convert input_schema to parameters
-            parameters = cls._convert_input_schema_to_parameters(
-                tool.input_schema, method=method, path_variables=path_variables
+            parameters = _get_input_schema_parameters(
+                input_schema, method=method, path_variables=path_variables
             )
 
             # Use response from response_mappings
             response = response_config
 
+            # Optional Cache-Control hint for HTTP layers in front of the proxy;
+            # the route's results are cached only if it is a positive number
+            cache_ttl = response_config.get("cache_ttl")
+            result_cache_ttl = _parse_cache_ttl(logger, cache_ttl, path)
+
             # Create function definition
-            function = {
-                "path": path,
-                "method": method,
-                "summary": tool.description,
-                "function_name": function_name,
-                "parameters": parameters,
-                "response": response,
-                "metadata": {
+            function = Function(
+                path=path,
+                method=method,
+                summary=description,
+                function_name=function_name,
+                parameters=parameters,
+                response=response,
+                metadata={
                     "mcp_server": mcp_server_name,
                     "is_mcp_tool": True,
+                    "cache_ttl": cache_ttl,
+                    "cacheable": result_cache_ttl is not None,
                 },
-            }
+            )
 
             functions.append(function)
 
             logger.info(
-                f"Mapped MCP tool '{function_name}' to path '{path}' with method '{method}'"
+                "Mapped MCP tool '%s' to path '%s' with method '%s'",
+                function_name,
+                path,
+                method,
             )
 
         return functions
 
     @classmethod
-    def _extract_path_variables(cls, path: str) -> list:
-        """
-        Extract variable names from path like /get/{id}/{name}
-
-        Returns: ["id", "name"]
-        """
-        import re
-
-        return re.findall(r"\{(\w+)\}", path)
+    def _extract_path_variables(cls, path: str) -> tuple:
+        """Extract variable names from a function path."""
+        return _extract_path_variables(path)
 
     @classmethod
     def _convert_input_schema_to_parameters(
         cls,
         input_schema: Dict[str, Any],
         method: str,
-        path_variables: list = None,
+        path_variables: tuple = (),
     ) -> list:
-        """
-        Convert JSON Schema to parameter list.
-
-        Rules:
-        - POST: all params in "body"
-        - GET: path variables in "path", others in "query"
-        """
-        if path_variables is None:
-            path_variables = []
-
-        parameters = []
-        properties = input_schema.get("properties", {})
-        required_fields = input_schema.get("required", [])
-
-        for prop_name, prop_def in properties.items():
-            # Determine parameter location
-            if method == "POST":
-                param_in = "body"
-            elif prop_name in path_variables:
-                param_in = "path"
-            else:
-                param_in = "query"
-
-            param = {
-                "name": prop_name,
-                "in": param_in,
-                "type": cls._map_json_schema_type(prop_def.get("type", "string")),
-                "required": prop_name in required_fields,
-            }
-
-            # Add description if available
-            if "description" in prop_def:
-                param["description"] = prop_def["description"]
-
-            # Handle nested objects
-            if prop_def.get("type") == "object":
-                if "properties" in prop_def:
-                    param["properties"] = cls._convert_nested_properties(
-                        prop_def["properties"]
-                    )
-
-            # Handle arrays
-            elif prop_def.get("type") == "array":
-                if "items" in prop_def:
-                    items = prop_def["items"]
-                    param["child_type"] = cls._map_json_schema_type(
-                        items.get("type", "string")
-                    )
-                    if items.get("type") == "object" and "properties" in items:
-                        param["properties"] = cls._convert_nested_properties(
-                            items["properties"]
-                        )
-
-            # Handle enums
-            if "enum" in prop_def:
-                param["enum"] = prop_def["enum"]
-
-            # Handle defaults
-            if "default" in prop_def:
-                param["default"] = prop_def["default"]
-
-            parameters.append(param)
-
-        return parameters
+        """Convert JSON Schema to parameter list."""
+        return _convert_input_schema_to_parameters(input_schema, method, path_variables)
 
     @classmethod
     def _convert_nested_properties(cls, properties: Dict[str, Any]) -> list:
-        """Recursively convert nested object properties."""
-        nested = []
-
-        for prop_name, prop_def in properties.items():
-            nested_prop = {
-                "name": prop_name,
-                "type": cls._map_json_schema_type(prop_def.get("type", "string")),
-            }
-
-            # Recursive handling for nested objects
-            if prop_def.get("type") == "object" and "properties" in prop_def:
-                nested_prop["properties"] = cls._convert_nested_properties(
-                    prop_def["properties"]
-                )
-
-            # Handle nested arrays
-            elif prop_def.get("type") == "array" and "items" in prop_def:
-                items = prop_def["items"]
-                nested_prop["child_type"] = cls._map_json_schema_type(
-                    items.get("type", "string")
-                )
-                if items.get("type") == "object" and "properties" in items:
-                    nested_prop["properties"] = cls._convert_nested_properties(
-                        items["properties"]
-                    )
-
-            nested.append(nested_prop)
-
-        return nested
+        """Convert nested object properties."""
+        return _convert_nested_properties(properties)
 
     @classmethod
     def _map_json_schema_type(cls, json_type: str) -> str:
         """Map JSON Schema types to OpenAPI/Config types."""
-        type_mapping = {
-            "string": "string",
-            "number": "float",
-            "integer": "integer",
-            "boolean": "boolean",
-            "array": "list",
-            "object": "dict",
-        }
-        return type_mapping.get(json_type, "string")
+        return _map_json_schema_type(json_type)
 
     @classmethod
     def _execute_graphql_query(
@@ -413,7 +1515,7 @@ class Config:
             query = Utility.generate_graphql_operation(
                 operation_name, operation_type, schema
             )
-            logger.info(f"Query: {query}/{function_name}")
+            logger.info("Query: %s/%s", query, function_name)
             return Utility.execute_graphql_query(
                 logger,
                 endpoint_id,
@@ -422,13 +1524,51 @@ class Config:
                 variables,
                 setting=setting,
                 execute_mode=setting.get("execute_mode"),
-                aws_lambda=cls.aws_lambda,
+                aws_lambda=cls.get_aws_lambda(),
             )
-        except Exception as e:
-            log = traceback.format_exc()
-            logger.error(log)
-            raise Exception(
-                f"Failed to execute GraphQL query ({function_name}/{endpoint_id}). Error: {e}"
+        except Exception:
+            logger.exception(
+                "Failed to execute GraphQL query (%s/%s)", function_name, endpoint_id
+            )
+            raise
+
+    @classmethod
+    def prefetch_schemas(
+        cls,
+        logger: logging.Logger,
+        endpoint_id: str,
+        function_names: List[str],
+        setting: Dict[str, Any] = {},
+    ) -> None:
+        """
+        Fetch and cache the GraphQL schemas for several functions concurrently.
+
+        Utility.fetch_graphql_schema is a blocking Lambda invoke, so the
+        fetches run on a thread pool; later _fetch_graphql_schema calls for
+        these functions are served from cls.schemas until they expire.
+        Args:
+            logger (logging.Logger): Logger instance for logging.
+            endpoint_id (str): ID of the endpoint to fetch schemas from.
+            function_names (List[str]): Names of functions to fetch schemas for.
+            setting (Dict[str, Any]): Optional settings dictionary.
+        """
+        missing = [fn for fn in function_names if cls._get_cached_schema(fn) is None]
+        if not missing:
+            return
+        if len(missing) == 1:
+            cls._fetch_graphql_schema(logger, endpoint_id, missing[0], setting)
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(8, len(missing))
+        ) as executor:
+            list(
+                executor.map(
+                    lambda fn: cls._fetch_graphql_schema(
+                        logger, endpoint_id, fn, setting
+                    ),
+                    missing,
+                )
             )
 
     # Fetches and caches GraphQL schema for a given function
@@ -452,14 +1592,139 @@ class Config:
         Returns:
             Dict containing the GraphQL schema
         """
-        # Check if schema exists in cache, if not fetch and store it
-        if cls.schemas.get(function_name) is None:
-            cls.schemas[function_name] = Utility.fetch_graphql_schema(
-                logger,
-                endpoint_id,
-                function_name,
-                setting=setting,
-                aws_lambda=cls.aws_lambda,
-                execute_mode=setting.get("execute_mode"),
-            )
-        return cls.schemas[function_name]
+        # Check if schema exists in cache, if not load or fetch and store it
+        schema = cls._get_cached_schema(function_name)
+        if schema is not None:
+            return schema
+
+        with cls._get_key_lock(cls._schema_locks, function_name):
+            # Another thread may have fetched it while we waited
+            schema = cls._get_cached_schema(function_name)
+            if schema is None:
+                cache_path = cls._get_schema_cache_path(endpoint_id, function_name)
+                cached = cls._load_cached_schema(logger, cache_path)
+                if cached is None:
+                    schema = Utility.fetch_graphql_schema(
+                        logger,
+                        endpoint_id,
+                        function_name,
+                        setting=setting,
+                        aws_lambda=cls.get_aws_lambda(),
+                        execute_mode=setting.get("execute_mode"),
+                    )
+                    cls._store_cached_schema(logger, cache_path, schema)
+                    age = 0
+                else:
+                    # Expire with the file, not a full TTL after loading it
+                    schema, age = cached
+                cls._schema_expires_at[function_name] = (
+                    time.monotonic() + cls.schema_cache_ttl - age
+                )
+                cls.schemas[function_name] = schema
+        return schema
+
+    @classmethod
+    def _get_cached_schema(cls, function_name: str) -> Optional[Dict[str, Any]]:
+        """Return the in-memory schema for a function unless it has expired."""
+        schema = cls.schemas.get(function_name)
+        if schema is None:
+            return None
+        if time.monotonic() >= cls._schema_expires_at.get(function_name, 0):
+            return None
+        return schema
+
+    @classmethod
+    def _get_schema_cache_dir(cls) -> Optional[str]:
+        """
+        Return the private on-disk schema cache directory, creating it with
+        mode 0o700, or None if it is not safe to use.
+
+        The directory lives in the shared temp dir, so it is only used when
+        it is a real directory owned by this user and closed to others.
+        """
+        if cls._schema_cache_dir is not None:
+            return cls._schema_cache_dir
+        uid = os.getuid() if hasattr(os, "getuid") else None
+        cache_dir = os.path.join(
+            tempfile.gettempdir(),
+            "mcp_proxy_engine_schemas" if uid is None else f"mcp_proxy_engine_{uid}",
+        )
+        try:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            st = os.lstat(cache_dir)
+        except OSError:
+            return None
+        if not stat.S_ISDIR(st.st_mode):
+            return None
+        if uid is not None and (st.st_uid != uid or st.st_mode & 0o077):
+            return None
+        cls._schema_cache_dir = cache_dir
+        return cache_dir
+
+    @classmethod
+    def _get_schema_cache_path(
+        cls, endpoint_id: str, function_name: str
+    ) -> Optional[str]:
+        """Return the on-disk cache file for an endpoint/function schema."""
+        cache_dir = cls._get_schema_cache_dir()
+        if cache_dir is None:
+            return None
+        key = hashlib.blake2b(
+            f"{endpoint_id}:{function_name}".encode(), digest_size=16
+        ).hexdigest()
+        return os.path.join(cache_dir, f"mcp_schema_{key}.json")
+
+    @classmethod
+    def _load_cached_schema(
+        cls, logger: logging.Logger, cache_path: Optional[str]
+    ) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Load a schema cached on disk by a previous invocation.
+
+        The file survives in /tmp across warm Lambda sandboxes; entries older
+        than schema_cache_ttl seconds, or not owned by this user, are ignored.
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], float]]: The schema and the age of
+                its file in seconds, or None.
+        """
+        if cache_path is None:
+            return None
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                st = os.fstat(f.fileno())
+                if hasattr(os, "getuid") and st.st_uid != os.getuid():
+                    logger.warning(
+                        "Ignoring cached GraphQL schema %s not owned by this user",
+                        cache_path,
+                    )
+                    return None
+                age = max(0.0, time.time() - st.st_mtime)
+                if age >= cls.schema_cache_ttl:
+                    return None
+                return json.load(f), age
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning(f"Failed to load cached GraphQL schema from {cache_path}")
+            return None
+
+    @classmethod
+    def _store_cached_schema(
+        cls, logger: logging.Logger, cache_path: Optional[str], schema: Dict[str, Any]
+    ) -> None:
+        """Write a schema to the on-disk cache atomically."""
+        if cache_path is None:
+            return
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(schema, f, separators=(",", ":"))
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            logger.warning(f"Failed to cache GraphQL schema to {cache_path}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -3,37 +3,39 @@ from __future__ import print_function
 
 __author__ = "bibow"
 
-import asyncio
+import json
 import logging
-import re
 import traceback
 from typing import Any, Dict, Optional, Tuple
 
-from mcp_http_client import MCPHttpClient
-
 from .config import Config  # Import Config class
+from .records import EndpointTables, Function
 
 
-def get_function_name_and_path_parameters(
-    logger: logging.Logger, path: str
-) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
+def get_function_and_path_parameters(
+    logger: logging.Logger, path: str, tables: Optional[EndpointTables] = None
+) -> Tuple[Optional[Function], Optional[Dict[str, str]]]:
     """
-    Extract the function name and path parameters from a URL path.
+    Extract the matched function and path parameters from a URL path.
     Args:
         logger (logging.Logger): Logger instance for logging information.
         path (str): The URL path.
+        tables (Optional[EndpointTables]): The endpoint's tables, as returned
+            by Config.initialize_for_endpoint; defaults to the active ones.
 
     Returns:
-        Tuple[Optional[str], Optional[Dict[str, str]]]: The function name and path parameters, or (None, None) if not found.
+        Tuple[Optional[Function], Optional[Dict[str, str]]]: The function and path parameters, or (None, None) if not found.
     """
     try:
-        for function in Config.functions:
-            # Replace placeholders with regex patterns for path parameters
-            pattern = re.sub(r"{(\w+)}", r"(?P<\1>[^/]+)", function["path"])
-            match = re.fullmatch(pattern, path)
-            if match:
-                return function["function_name"], match.groupdict()
-        return None, None
+        # Routes are matched against the endpoint's tables, with repeat
+        # paths served from its LRU cache
+        if tables is None:
+            tables = Config.get_active_tables()
+        function, path_parameters = tables.match_route(path)
+        if path_parameters is None:
+            return None, None
+        # Copy so callers cannot alter the cached parameters
+        return function, dict(path_parameters)
     except Exception as e:
         logger.error(
             f"Error extracting function name and parameters: {traceback.format_exc()}"
@@ -41,25 +43,29 @@ def get_function_name_and_path_parameters(
         raise e
 
 
-async def _run_call_mcp_http_tool(
-    logger: logging.Logger,
-    mcp_http_client: MCPHttpClient,
-    name: str,
-    arguments: Dict[str, Any],
-) -> Any:
-    logger.info(f"Calling MCP HTTP tool: {name} with arguments: {arguments}")
-
-    async with mcp_http_client as client:
-        result = await client.call_tool(name, arguments)
-
-        logger.info(f"MCP HTTP tool {name} returned result: {result}")
+def get_function_name_and_path_parameters(
+    logger: logging.Logger, path: str, tables: Optional[EndpointTables] = None
+) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
+    """
+    Extract the function name and path parameters from a URL path.
+    Args:
+        logger (logging.Logger): Logger instance for logging information.
+        path (str): The URL path.
+        tables (Optional[EndpointTables]): The endpoint's tables, as returned
+            by Config.initialize_for_endpoint; defaults to the active ones.
 
-        return result
+    Returns:
+        Tuple[Optional[str], Optional[Dict[str, str]]]: The function name and path parameters, or (None, None) if not found.
+    """
+    function, path_parameters = get_function_and_path_parameters(logger, path, tables)
+    if function is None:
+        return None, None
+    return function.function_name, path_parameters
 
 
 def _execute_mcp_tool(
     logger: logging.Logger,
-    mcp_http_client: MCPHttpClient,
+    mcp_http_client: Dict[str, Any],
     function_name: str,
     **arguments: Dict[str, Any],
 ) -> Any:
@@ -67,48 +73,89 @@ def _execute_mcp_tool(
     Private function to execute MCP tool with given arguments.
     Args:
         logger (logging.Logger): Logger instance for logging information.
-        mcp_http_client (MCPHttpClient): The MCP HTTP client instance.
+        mcp_http_client (Dict[str, Any]): The function_to_client entry of the
+            MCP server providing the tool.
         function_name (str): Name of the function to execute.
         **arguments: Arguments to pass to the MCP tool.
 
     Returns:
         Any: The result from the MCP tool execution.
     """
-    return asyncio.run(
-        _run_call_mcp_http_tool(logger, mcp_http_client, function_name, arguments)
-    )
+    # Call the entry's own client: server names are not guaranteed unique
+    return Config.call_tool(logger, mcp_http_client["client"], function_name, arguments)
+
+
+def _get_result_cache_key(
+    function_name: str, arguments: Dict[str, Any]
+) -> Optional[Tuple[str, str]]:
+    """
+    Build the result cache key for a call, or None if the arguments cannot
+    be encoded (such calls are not cached).
+    """
+    try:
+        return function_name, json.dumps(
+            arguments, sort_keys=True, separators=(",", ":")
+        )
+    except (TypeError, ValueError):
+        return None
 
 
 def execute_function(
-    logger: logging.Logger, function_name: str, **kwargs: Dict[str, Any]
+    logger: logging.Logger,
+    function_name: str,
+    tables: Optional[EndpointTables] = None,
+    route_path: Optional[str] = None,
+    /,
+    **kwargs: Dict[str, Any],
 ) -> Optional[Dict]:
     """
     Execute the specified function with the given parameters.
     Args:
         logger (logging.Logger): Logger instance for logging information.
         function_name (str): Name of the function to execute.
+        tables (Optional[EndpointTables]): The endpoint's tables, as returned
+            by Config.initialize_for_endpoint; defaults to the active ones.
+        route_path (Optional[str]): Path template of the matched route. Its
+            response mapping's cache_ttl, if any, enables result caching.
+            tables and route_path are positional only, so any keyword is
+            left for the tool.
         **kwargs: Parameters to pass to the function.
 
     Returns:
         Optional[Dict]: The result of the function execution, or None if an error occurs.
     """
     try:
-        mcp_http_client = next(
-            (
-                client["client"]
-                for client in Config.mcp_http_clients
-                if function_name in client["tools"]
-            ),
-            None,
-        )
+        if tables is None:
+            tables = Config.get_active_tables()
+        mcp_http_client = tables.function_to_client.get(function_name)
 
         # If function is found in MCP tools, call it through the MCP client
         if mcp_http_client:
-            logger.info(f"Executing function {function_name} with parameters: {kwargs}")
-            result = _execute_mcp_tool(
-                logger, mcp_http_client, function_name, **kwargs
+            # Serve repeated calls from the result cache when the matched
+            # route's response mapping sets a cache_ttl
+            result_cache = tables.result_cache
+            cache_ttl = (
+                tables.result_cache_ttls.get(route_path)
+                if route_path is not None
+                else None
+            )
+            cache_key = (
+                _get_result_cache_key(function_name, kwargs) if cache_ttl else None
+            )
+            if cache_key is not None:
+                text = result_cache.get(cache_key)
+                if text is not None:
+                    logger.info("Serving function %s from result cache", function_name)
+                    return text
+
+            logger.info(
+                "Executing function %s with parameters: %s", function_name, kwargs
             )
-            return result[0]["text"]
+            result = _execute_mcp_tool(logger, mcp_http_client, function_name, **kwargs)
+            text = result[0]["text"]
+            if cache_key is not None:
+                result_cache.set(cache_key, text, cache_ttl)
+            return text
 
         if not mcp_http_client:
             logger.exception(f"{function_name} is not supported!!")
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+__author__ = "bibow"
+
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+from .result_cache import ResultCache
+
+# Marks optional fields that are not set, so a legitimate None (e.g. a JSON
+# Schema "default": null) is still emitted.
+_MISSING = object()
+
+
+def _to_plain(value: Any) -> Any:
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+class _Record:
+    """
+    Base class for slotted records that replace the per-function and
+    per-parameter dicts built from MCP tool schemas.
+
+    Fields live in __slots__, and item access maps the dict keys used by the
+    handlers onto those slots, so existing readers keep working unchanged.
+    Optional fields that were never set behave like missing keys.
+    """
+
+    __slots__ = ()
+    # (dict key, slot name) pairs in serialization order
+    _fields: Tuple[Tuple[str, str], ...] = ()
+    _slot_names: Dict[str, str] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._slot_names = dict(cls._fields)
+
+    def __getitem__(self, key: str) -> Any:
+        value = getattr(self, self._slot_names[key])
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        setattr(self, self._slot_names[key], value)
+
+    def __contains__(self, key: object) -> bool:
+        slot_name = self._slot_names.get(key)  # type: ignore[arg-type]
+        return slot_name is not None and getattr(self, slot_name) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (_Record, dict)):
+            return self.to_dict() == _to_plain(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        slot_name = self._slot_names.get(key)
+        if slot_name is None:
+            return default
+        value = getattr(self, slot_name)
+        return default if value is _MISSING else value
+
+    def keys(self) -> List[str]:
+        return [
+            key
+            for key, slot_name in self._fields
+            if getattr(self, slot_name) is not _MISSING
+        ]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as the plain dict it replaces, with only set keys."""
+        return {key: _to_plain(value) for key, value in self.items()}
+
+
+class Parameter(_Record):
+    """A request parameter, or a nested property of one."""
+
+    __slots__ = (
+        "name",
+        "in_",
+        "type",
+        "required",
+        "description",
+        "child_type",
+        "properties",
+        "enum",
+        "default",
+    )
+    _fields = (
+        ("name", "name"),
+        ("in", "in_"),
+        ("type", "type"),
+        ("required", "required"),
+        ("description", "description"),
+        ("child_type", "child_type"),
+        ("properties", "properties"),
+        ("enum", "enum"),
+        ("default", "default"),
+    )
+
+    def __init__(
+        self,
+        name: str,
+        type: str,
+        in_: Any = _MISSING,
+        required: Any = _MISSING,
+        description: Any = _MISSING,
+        child_type: Any = _MISSING,
+        properties: Any = _MISSING,
+        enum: Any = _MISSING,
+        default: Any = _MISSING,
+    ) -> None:
+        self.name = name
+        self.in_ = in_
+        self.type = type
+        self.required = required
+        self.description = description
+        self.child_type = child_type
+        self.properties = properties
+        self.enum = enum
+        self.default = default
+
+
+class Function(_Record):
+    """A function exposed by the proxy and backed by an MCP tool."""
+
+    __slots__ = (
+        "path",
+        "method",
+        "summary",
+        "function_name",
+        "parameters",
+        "response",
+        "metadata",
+    )
+    _fields = tuple((slot_name, slot_name) for slot_name in __slots__)
+
+    def __init__(
+        self,
+        path: str,
+        method: str,
+        summary: Any,
+        function_name: str,
+        parameters: List[Parameter],
+        response: Dict[str, Any],
+        metadata: Dict[str, Any],
+    ) -> None:
+        self.path = path
+        self.method = method
+        self.summary = summary
+        self.function_name = function_name
+        self.parameters = parameters
+        self.response = response
+        self.metadata = metadata
+
+
+class EndpointTables(NamedTuple):
+    """
+    Immutable view of one endpoint build, read once per request.
+
+    A rebuild creates a new instance instead of mutating this one, so a
+    request keeps a consistent set of tables even if the endpoint is
+    refreshed, or another endpoint activated, while it runs.
+    """
+
+    mcp_http_clients: Tuple[Dict[str, Any], ...]
+    functions: Tuple[Function, ...]
+    # path -> (function_name, path_parameters), see config._make_route_matcher
+    match_route: Callable[[str], Tuple[Any, Any]]
+    function_to_client: Dict[str, Dict[str, Any]]
+    result_cache: ResultCache
+    result_cache_ttls: Dict[str, Any]
+    # (endpoint_id, swagger settings) -> (functions, YAML), see swagger_generator
+    swagger_cache: Dict[Any, Any]
@@ -4,11 +4,18 @@ from __future__ import print_function
 __author__ = "bibow"
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import yaml
 
 from .config import Config  # Import Config class
+from .records import EndpointTables
+
+# libyaml's C emitter when available; the swagger dict holds plain data only
+try:
+    from yaml import CSafeDumper as SwaggerDumper
+except ImportError:
+    from yaml import SafeDumper as SwaggerDumper
 
 # Mapping from data types to OpenAPI schema types
 TYPE_MAPPING = {
@@ -23,16 +30,32 @@ TYPE_MAPPING = {
 }
 
 
-def generate_swagger_yaml(logger: logging.Logger, endpoint_id: str) -> str:
+def generate_swagger_yaml(
+    logger: logging.Logger, endpoint_id: str, tables: Optional[EndpointTables] = None
+) -> str:
     """
     Generates the Swagger YAML for the application.
     Args:
         logger (logging.Logger): Logger instance for logging.
+        endpoint_id (str): ID of the endpoint, used in the operation paths.
+        tables (Optional[EndpointTables]): The endpoint's tables, as returned
+            by Config.initialize_for_endpoint; defaults to the active ones.
 
     Returns:
         str: The generated Swagger YAML as a string.
     """
     try:
+        if tables is None:
+            tables = Config.get_active_tables()
+        functions = tables.functions
+        # The YAML is cached in the endpoint's own tables, so it is evicted
+        # with them; the functions sequence is kept so a rebuild misses
+        swagger_cache = tables.swagger_cache
+        cache_key = (endpoint_id, (Config.title, Config.version, tuple(Config.servers)))
+        cached = swagger_cache.get(cache_key)
+        if cached is not None and cached[0] is functions:
+            return cached[1]
+
         logger.info("Generating Swagger YAML...")
 
         # Base Swagger configuration
@@ -47,7 +70,7 @@ def generate_swagger_yaml(logger: logging.Logger, endpoint_id: str) -> str:
         }
 
         # Generate paths and methods from functions
-        for function in Config.functions:
+        for function in functions:
             path = f"/beta/core/{endpoint_id}/openai_action_dispatch/{function['path']}"
             method = function["method"].lower()
             summary = function.get("summary", "No summary provided")
@@ -135,8 +158,17 @@ def generate_swagger_yaml(logger: logging.Logger, endpoint_id: str) -> str:
             }
 
         # Convert to YAML
+        swagger_yaml = yaml.dump(
+            swagger,
+            Dumper=SwaggerDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+        )
+        # Only the latest settings are kept, so the cache stays a single entry
+        swagger_cache.clear()
+        swagger_cache[cache_key] = (functions, swagger_yaml)
         logger.info("Swagger YAML generated successfully.")
-        return yaml.dump(swagger, default_flow_style=False, allow_unicode=True)
+        return swagger_yaml
 
     except Exception as e:
         logger.exception("Failed to generate Swagger YAML.")
@@ -145,36 +177,47 @@ def generate_swagger_yaml(logger: logging.Logger, endpoint_id: str) -> str:
 
 def _handle_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Recursively handle nested properties for schemas.
+    Handle nested properties for schemas.
+
+    Uses an explicit work stack of (properties, result) pairs instead of
+    recursion, so deeply nested schemas cannot hit the recursion limit.
     Args:
         properties (Any): List or dictionary of properties.
 
     Returns:
         Dict[str, Any]: OpenAPI-compatible schema properties.
     """
-    result = {}
-    for prop in properties:
-        prop_type = TYPE_MAPPING.get(prop["type"], "string")
-        if prop_type == "array" and "child_type" in prop:
-            child_type = TYPE_MAPPING.get(prop["child_type"], "string")
-            nested_properties = (
-                _handle_properties(prop["properties"]) if "properties" in prop else {}
-            )
-            result[prop["name"]] = {
-                "type": "array",
-                "items": {
-                    "type": child_type,
-                    "properties": nested_properties if child_type == "object" else None,
-                },
-            }
-        elif prop_type == "object" and "properties" in prop:
-            result[prop["name"]] = {
-                "type": "object",
-                "properties": _handle_properties(prop["properties"]),
-            }
-        else:
-            result[prop["name"]] = {"type": prop_type}
-    return result
+    map_type = TYPE_MAPPING.get
+    root = {}
+    stack = [(properties, root)]
+    while stack:
+        props, result = stack.pop()
+        for prop in props:
+            prop_type = map_type(prop["type"], "string")
+            if prop_type == "array" and "child_type" in prop:
+                child_type = map_type(prop["child_type"], "string")
+                nested_properties = None
+                if child_type == "object":
+                    nested_properties = {}
+                    if "properties" in prop:
+                        stack.append((prop["properties"], nested_properties))
+                result[prop["name"]] = {
+                    "type": "array",
+                    "items": {
+                        "type": child_type,
+                        "properties": nested_properties,
+                    },
+                }
+            elif prop_type == "object" and "properties" in prop:
+                nested_properties = {}
+                stack.append((prop["properties"], nested_properties))
+                result[prop["name"]] = {
+                    "type": "object",
+                    "properties": nested_properties,
+                }
+            else:
+                result[prop["name"]] = {"type": prop_type}
+    return root
 
 
 def _build_response_schema(response_config: Dict[str, Any]) -> Dict[str, Any]:
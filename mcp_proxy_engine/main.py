@@ -5,6 +5,7 @@ from __future__ import print_function
 __author__ = "bibow"
 
 import logging
+import sys
 from typing import Any, Dict, List, Tuple
 
 from silvaengine_utility import Utility
@@ -12,31 +13,40 @@ from silvaengine_utility import Utility
 from .handlers.config import Config
 from .handlers.function_handler import (
     execute_function,
-    get_function_name_and_path_parameters,
+    get_function_and_path_parameters,
 )
 from .handlers.swagger_generator import generate_swagger_yaml
 
 
+class MissingPathError(ValueError):
+    """Raised when mcp_proxy_dispatch is called without a path."""
+
+
+# Deployment manifest for the deploy hook, built once at import. deploy()
+# returns this shared list itself, so treat it as read-only
+_DEPLOY_MANIFEST = [
+    {
+        "service": "MCP Proxy Engine",
+        "class": "McpProxyEngine",
+        "functions": {
+            "mcp_proxy_dispatch": {
+                "is_static": False,
+                "label": "MCP Proxy Dispatch",
+                "type": "RequestResponse",
+                "support_methods": ["GET", "POST", "PUT", "PATCH", "DELETE"],
+                "is_auth_required": False,
+                "is_graphql": False,
+                "settings": "mcp_proxy_engine",
+                "disabled_in_resources": True,  # Ignore adding to resource list.
+            },
+        },
+    }
+]
+
+
 # Hook function applied to deployment
 def deploy() -> List:
-    return [
-        {
-            "service": "MCP Proxy Engine",
-            "class": "McpProxyEngine",
-            "functions": {
-                "mcp_proxy_dispatch": {
-                    "is_static": False,
-                    "label": "MCP Proxy Dispatch",
-                    "type": "RequestResponse",
-                    "support_methods": ["GET", "POST", "PUT", "PATCH", "DELETE"],
-                    "is_auth_required": False,
-                    "is_graphql": False,
-                    "settings": "mcp_proxy_engine",
-                    "disabled_in_resources": True,  # Ignore adding to resource list.
-                },
-            },
-        }
-    ]
+    return _DEPLOY_MANIFEST
 
 
 class McpProxyEngine(object):
@@ -52,30 +62,47 @@ class McpProxyEngine(object):
 
         self.logger = logger
         self.setting = setting
+        # Fallback endpoint for dispatches that do not pass one
+        self._default_endpoint_id = setting.get("endpoint_id")
 
     def mcp_proxy_dispatch(self, **kwargs: Dict[str, Any]) -> Any:
         endpoint_id = kwargs.pop("endpoint_id", None)
         ## Test the waters 🧪 before diving in!
         ##<--Testing Data-->##
         if endpoint_id is None:
-            endpoint_id = self.setting.get("endpoint_id")
+            endpoint_id = self._default_endpoint_id
         ##<--Testing Data-->##
+        # Interned ids compare by identity in the per-endpoint dict lookups
+        if type(endpoint_id) is str:
+            endpoint_id = sys.intern(endpoint_id)
 
-        Config.set_mcp_servers(self.logger, endpoint_id, self.setting)
-        Config.initialize_mcp_http_clients(self.logger)
+        # One consistent view of the endpoint for the whole request, even if
+        # another thread activates a different endpoint meanwhile
+        tables = Config.initialize_for_endpoint(self.logger, endpoint_id, self.setting)
 
-        path = "/" + kwargs.pop("path")
+        path = kwargs.pop("path", None)
         if path is None:
-            raise Exception("path is required!!")
-        self.logger.info(f"path = {path}")
+            raise MissingPathError("path is required!!")
+        # Proxies may already pass an absolute path; avoid "//path"
+        if not path.startswith("/"):
+            path = "/" + path
+        self.logger.info("path = %s", path)
 
-        if path.find("openapi.yaml") != -1:
-            return generate_swagger_yaml(self.logger, endpoint_id)
+        if path.endswith("openapi.yaml"):
+            return generate_swagger_yaml(self.logger, endpoint_id, tables)
         else:
-            function_name, path_parameters = get_function_name_and_path_parameters(
-                self.logger, path
+            function, path_parameters = get_function_and_path_parameters(
+                self.logger, path, tables
             )
-            if path_parameters is not None:
-                kwargs = dict(kwargs, **path_parameters)
+            # kwargs is this call's own dict, so merge in place (path
+            # parameters still win) instead of copying it
+            if path_parameters:
+                kwargs.update(path_parameters)
 
-            return execute_function(self.logger, function_name, **kwargs)
+            if function is None:
+                function_name = route_path = None
+            else:
+                function_name, route_path = function.function_name, function.path
+            return execute_function(
+                self.logger, function_name, tables, route_path, **kwargs
+            )
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+__author__ = "bibow"
+
+import logging
+import types
+import unittest
+
+from mcp_proxy_engine.handlers.config import Config
+from mcp_proxy_engine.handlers.function_handler import (
+    execute_function,
+    get_function_and_path_parameters,
+)
+from mcp_proxy_engine.handlers.records import Function
+
+
+class _FakeMCPHttpClient:
+    def __init__(self, server):
+        self.server = server
+        self.calls = 0
+
+    async def call_tool(self, name, arguments):
+        self.calls += 1
+        return [{"type": "text", "text": f"{self.server}:{name}"}]
+
+
+def _make_function(path, function_name, cache_ttl=None):
+    return Function(
+        path,
+        "GET",
+        "",
+        function_name,
+        [],
+        {},
+        {"cache_ttl": cache_ttl, "cacheable": cache_ttl is not None},
+    )
+
+
+class ExecuteFunctionTest(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger(__name__)
+        self.addCleanup(Config.shutdown)
+
+    def _build_tables(self, mcp_http_clients, functions):
+        endpoint_data = {
+            "mcp_servers": [],
+            "mcp_http_clients": mcp_http_clients,
+            "functions": functions,
+        }
+        Config._index_endpoint_data(endpoint_data)
+        return endpoint_data["tables"]
+
+    def _dispatch(self, tables, path):
+        function, path_parameters = get_function_and_path_parameters(
+            self.logger, path, tables
+        )
+        return execute_function(
+            self.logger,
+            function.function_name,
+            tables,
+            function.path,
+            **path_parameters,
+        )
+
+    def test_calls_the_serving_client_when_server_names_repeat(self):
+        tables = self._build_tables(
+            [
+                {"name": "dup", "client": _FakeMCPHttpClient("a"), "tools": ["t1"]},
+                {"name": "dup", "client": _FakeMCPHttpClient("b"), "tools": ["t2"]},
+            ],
+            [_make_function("/t1", "t1"), _make_function("/t2", "t2")],
+        )
+        self.assertEqual(execute_function(self.logger, "t1", tables), "a:t1")
+        self.assertEqual(execute_function(self.logger, "t2", tables), "b:t2")
+
+    def test_result_cache_ttl_is_per_route(self):
+        for reverse in (False, True):
+            client = _FakeMCPHttpClient("a")
+            functions = [
+                _make_function("/get_item/{id}", "get_item", cache_ttl=30),
+                _make_function("/get_item/all", "get_item"),
+            ]
+            if reverse:
+                functions.reverse()
+            tables = self._build_tables(
+                [{"name": "a", "client": client, "tools": ["get_item"]}], functions
+            )
+            for _ in range(2):
+                self._dispatch(tables, "/get_item/all")
+            self.assertEqual(client.calls, 2)
+            for _ in range(2):
+                self._dispatch(tables, "/get_item/1")
+            self.assertEqual(client.calls, 3)
+
+    def test_cacheable_reflects_a_valid_cache_ttl(self):
+        tool = types.SimpleNamespace(
+            name="get_item", description="", input_schema={"properties": {}}
+        )
+        response_mappings = {
+            "/get_item/{id}": {"type": "dict", "properties": [], "cache_ttl": "30"},
+            "/get_item/all": {"type": "dict", "properties": []},
+            "/get_item/bad": {"type": "dict", "properties": [], "cache_ttl": "x"},
+        }
+        functions = Config._convert_mcp_tools_to_functions(
+            [tool], "a", response_mappings, self.logger
+        )
+        self.assertEqual(
+            [function.metadata["cacheable"] for function in functions],
+            [True, False, False],
+        )
+        tables = self._build_tables([], functions)
+        self.assertEqual(tables.result_cache_ttls, {"/get_item/{id}": 30.0})
+
+    def test_unknown_function_raises(self):
+        tables = self._build_tables([], [])
+        with self.assertRaises(Exception):
+            execute_function(self.logger, "missing", tables)
+
+
+if __name__ == "__main__":
+    unittest.main()
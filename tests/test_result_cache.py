@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+__author__ = "bibow"
+
+import unittest
+from unittest import mock
+
+from mcp_proxy_engine.handlers import result_cache
+from mcp_proxy_engine.handlers.result_cache import ResultCache
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(result_cache, "time")
+        self.time = patcher.start()
+        self.time.monotonic.return_value = 100.0
+        self.addCleanup(patcher.stop)
+
+    def test_get_returns_value_until_ttl_expires(self):
+        cache = ResultCache()
+        cache.set("key", "value", 10)
+        self.time.monotonic.return_value = 109.9
+        self.assertEqual(cache.get("key"), "value")
+        self.time.monotonic.return_value = 110.0
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(maxsize=2)
+        cache.set("a", 1, 10)
+        cache.set("b", 2, 10)
+        # Reading "a" makes "b" the least recently used entry
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3, 10)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_set_refreshes_existing_entry(self):
+        cache = ResultCache(maxsize=2)
+        cache.set("a", 1, 10)
+        cache.set("b", 2, 10)
+        cache.set("a", 10, 10)
+        cache.set("c", 3, 10)
+        self.assertEqual(cache.get("a"), 10)
+        self.assertIsNone(cache.get("b"))
+
+    def test_non_positive_maxsize_disables_caching(self):
+        for maxsize in (0, -1):
+            cache = ResultCache(maxsize=maxsize)
+            cache.set("key", "value", 10)
+            self.assertIsNone(cache.get("key"))
+            self.assertEqual(cache.stats()["size"], 0)
+
+    def test_stats_and_clear(self):
+        cache = ResultCache()
+        cache.set("key", "value", 10)
+        cache.get("key")
+        cache.get("key")
+        cache.get("missing")
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 1, "size": 1})
+        cache.clear()
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 0, "size": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
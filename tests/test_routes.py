@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+__author__ = "bibow"
+
+import random
+import re
+import unittest
+
+from mcp_proxy_engine.handlers.config import _PATH_VAR_RE, _build_routes
+from mcp_proxy_engine.handlers.records import Function
+
+
+def _make_functions(paths):
+    return [
+        Function(path, "GET", "", f"function_{index}", [], {}, {"cache_ttl": None})
+        for index, path in enumerate(paths)
+    ]
+
+
+def _baseline_match(functions, path):
+    """
+    The resolver before the route tables: the first function whose path,
+    read as a regex, fully matches wins, static paths included.
+    """
+    for function in functions:
+        pattern = re.sub(r"{(\w+)}", r"(?P<\1>[^/]+)", function.path)
+        match = re.fullmatch(pattern, path)
+        if match:
+            return function.function_name, match.groupdict()
+    return None, None
+
+
+def _static_first_match(functions, path):
+    """
+    Reference resolver for match_route: the baseline scan, except that paths
+    without {variables} are compared as plain strings and tried first.
+    """
+    for function in functions:
+        if "{" not in function.path and function.path == path:
+            return function.function_name, {}
+    for function in functions:
+        if "{" in function.path:
+            pattern = re.sub(r"{(\w+)}", r"(?P<\1>[^/]+)", function.path)
+            match = re.fullmatch(pattern, path)
+            if match:
+                return function.function_name, match.groupdict()
+    return None, None
+
+
+def _resolve(match_route, path):
+    """Return (function_name, path_parameters) for a match_route lookup."""
+    function, path_parameters = match_route(path)
+    if function is None:
+        return None, path_parameters
+    return function.function_name, dict(path_parameters)
+
+
+class RouteMatcherTest(unittest.TestCase):
+    def assertMatchesStaticFirstScan(self, paths, lookups):
+        functions = _make_functions(paths)
+        match_route = _build_routes(functions)["match_route"]
+        for path in lookups:
+            self.assertEqual(
+                _resolve(match_route, path),
+                _static_first_match(functions, path),
+                f"{path!r} against {paths!r}",
+            )
+
+    def test_first_function_wins(self):
+        paths = ["/items/{id}", "/items/{name}", "/{kind}/x", "/items/x/{id}"]
+        self.assertMatchesStaticFirstScan(
+            paths, ["/items/1", "/items/x", "/other/x", "/items/x/2"]
+        )
+        match_route = _build_routes(_make_functions(paths))["match_route"]
+        self.assertEqual(_resolve(match_route, "/items/x"), ("function_0", {"id": "x"}))
+
+    def test_static_paths_take_precedence(self):
+        paths = ["/{name}", "/health", "/a/{b}", "/a/b"]
+        match_route = _build_routes(_make_functions(paths))["match_route"]
+        self.assertEqual(_resolve(match_route, "/health"), ("function_1", {}))
+        self.assertEqual(_resolve(match_route, "/a/b"), ("function_3", {}))
+        self.assertEqual(
+            _resolve(match_route, "/other"), ("function_0", {"name": "other"})
+        )
+        self.assertMatchesStaticFirstScan(paths, ["/health", "/a/b", "/a/c", "/x"])
+
+    def test_static_first_differs_from_baseline(self):
+        functions = _make_functions(["/get_item/{id}", "/get_item/all", "/s.t"])
+        match_route = _build_routes(functions)["match_route"]
+        self.assertEqual(
+            _baseline_match(functions, "/get_item/all"), ("function_0", {"id": "all"})
+        )
+        self.assertEqual(_resolve(match_route, "/get_item/all"), ("function_1", {}))
+        # Static paths are no longer read as regexes
+        self.assertEqual(_baseline_match(functions, "/sxt"), ("function_2", {}))
+        self.assertEqual(_resolve(match_route, "/sxt"), (None, None))
+
+    def test_mixed_segments(self):
+        paths = ["/files/{id}.json", "/files/{id}", "/v{version}/{id}"]
+        self.assertMatchesStaticFirstScan(
+            paths, ["/files/42.json", "/files/42", "/files/.json", "/v2/9", "/v/9"]
+        )
+
+    def test_regex_metacharacter_segments(self):
+        paths = ["/v1.0/{id}", "/a+b/{id}", "/(x)/{id}", "/s.t", "/{id}/c*"]
+        self.assertMatchesStaticFirstScan(
+            paths,
+            ["/v1.0/1", "/v1x0/1", "/a+b/1", "/aab/1", "/(x)/1", "/x/1"]
+            + ["/s.t", "/sxt", "/1/c*", "/1/cc"],
+        )
+
+    def test_empty_segments(self):
+        paths = ["/a//{id}", "/a/{id}", "/{id}/", "//{id}"]
+        self.assertMatchesStaticFirstScan(
+            paths, ["/a//1", "/a/", "/a/1", "/1/", "//1", "//", "/", ""]
+        )
+
+    def test_no_match(self):
+        match_route = _build_routes(_make_functions(["/a/{id}"]))["match_route"]
+        self.assertEqual(_resolve(match_route, "/b/1"), (None, None))
+        self.assertEqual(_resolve(match_route, "/a/1/2"), (None, None))
+
+    def test_random_routes_match_static_first_scan(self):
+        rng = random.Random(7)
+        template_segments = ["get", "q", "a", "{id}", "{v}", "{w}"]
+        template_segments += ["s.t", "{f}.json", ""]
+        lookup_segments = ["get", "q", "a", "x", "s.t", "sxt", "", "1.json"]
+        for _ in range(200):
+            paths = []
+            for _ in range(rng.randint(1, 12)):
+                path = "/" + "/".join(
+                    rng.choice(template_segments) for _ in range(rng.randint(1, 4))
+                )
+                names = _PATH_VAR_RE.findall(path)
+                # Repeated variable names are not valid group names
+                if len(set(names)) == len(names):
+                    paths.append(path)
+            lookups = [
+                "/"
+                + "/".join(
+                    rng.choice(lookup_segments) for _ in range(rng.randint(1, 4))
+                )
+                for _ in range(100)
+            ]
+            self.assertMatchesStaticFirstScan(paths, lookups)
+
+
+if __name__ == "__main__":
+    unittest.main()